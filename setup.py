@@ -20,15 +20,19 @@ with open(path.join(here, 'requirements.txt')) as f:
 # The following reads the variables without doing an "import spiral",
 # because the latter will cause the python execution environment to fail if
 # any dependencies are not already installed -- negating most of the reason
-# we're using setup() in the first place.  This code avoids eval, for security.
+# we're using setup() in the first place.  Parsing the file with ast keeps
+# it eval-free while handling the string values properly (the old
+# line-splitting approach broke on any value containing '=' or quotes).
+
+import ast
 
 version = {}
 with open(path.join(here, 'spiral/__version__.py')) as f:
-    text = f.read().rstrip().splitlines()
-    vars = [line for line in text if line.startswith('__') and '=' in line]
-    for v in vars:
-        setting = v.split('=')
-        version[setting[0].strip()] = setting[1].strip().replace("'", '')
+    for node in ast.parse(f.read()).body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)
+                and isinstance(node.value, ast.Constant)):
+            version[node.targets[0].id] = node.value.value
 
 # Finally, define our namesake.
 
@@ -43,7 +47,8 @@ setup(
     license              = version['__license__'],
     keywords             = "program-analysis text-processing machine-learning",
     packages             = ['spiral'],
-    package_data         = {'spiral': ['data/frequencies.pklz',
+    package_data         = {'spiral': ['data/frequencies.npz',
+                             'data/frequencies.pklz',
                              'data/dictionary.pklz']},
     scripts              = ['bin/spiral'],
     include_package_data = True,
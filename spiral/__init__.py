@@ -36,6 +36,8 @@ from .__version__ import __license__, __copyright__
 # Supporting modules.
 from .frequencies import frequencies_from_csv_file, frequencies_from_pickle
 from .frequencies import save_frequencies_to_pickle
+from .frequencies import frequencies_from_npz, save_frequencies_to_npz
+from .frequencies import frequency_arrays_from_npz
 
 # Simple splitters.
 from .simple_splitters import delimiter_split, digit_split, pure_camelcase_split
@@ -115,11 +115,19 @@ and exit without doing anything more.
 
 
 def split(string_list, splitter_functions):
-    init, split = splitter_functions
+    init, split_function = splitter_functions
     if init:
         init()
-    for s in [string.rstrip() for string in string_list]:
-        print('{}: {}'.format(s, split(s)))
+    # Real input files repeat identifiers heavily, so split each distinct
+    # string once and reuse the result for later occurrences of the same
+    # string.
+    results = {}
+    for s in string_list:
+        s = s.rstrip()
+        result = results.get(s)
+        if result is None:
+            result = results[s] = split_function(s)
+        print('{}: {}'.format(s, result))
 
 
 if __name__ == '__main__':
@@ -501,7 +501,7 @@ are not found in dictionaries.
 #
 # I made additions to the prefixes.
 
-prefixes = {'afro', 'ambi', 'amphi', 'ana', 'anglo', 'apo', 'astro', 'bi',
+prefixes = frozenset({'afro', 'ambi', 'amphi', 'ana', 'anglo', 'apo', 'astro', 'bi',
             'bio', 'circum', 'cis', 'co', 'col', 'com', 'con', 'contra',
             'cor', 'cryo', 'crypto', 'de', 'de', 'demi', 'di', 'dif',
             'dis', 'du', 'duo', 'eco', 'electro', 'em', 'en', 'epi',
@@ -512,9 +512,9 @@ prefixes = {'afro', 'ambi', 'amphi', 'ana', 'anglo', 'apo', 'astro', 'bi',
             'paleo', 'para', 'ped', 'peri', 'poly', 'pre', 'preter',
             'proto', 'pyro', 're', 'retro', 'semi', 'socio', 'supra',
             'sur', 'sy', 'syl', 'sym', 'syn', 'tele', 'trans', 'tri',
-            'twi', 'ultra', 'un', 'uni', 'non'}
+            'twi', 'ultra', 'un', 'uni', 'non'})
 
-suffixes = {'a', 'ac', 'acea', 'aceae', 'acean', 'aceous', 'ade', 'aemia',
+suffixes = frozenset({'a', 'ac', 'acea', 'aceae', 'acean', 'aceous', 'ade', 'aemia',
             'agogue', 'aholic', 'al', 'ales', 'algia', 'amine', 'ana',
             'anae', 'ance', 'ancy', 'androus', 'andry', 'ane', 'ar',
             'archy', 'ard', 'aria', 'arian', 'arium', 'ary', 'ase',
@@ -563,4 +563,4 @@ suffixes = {'a', 'ac', 'acea', 'aceae', 'acean', 'aceous', 'ade', 'aemia',
             'tropous', 'tropy', 'tude', 'ty', 'ular', 'ule', 'ure',
             'urgy', 'uria', 'uronic', 'urous', 'valent', 'virile',
             'vorous', 'xor', 'y', 'yl', 'yne', 'zoic', 'zoon', 'zygous',
-            'zyme'}
+            'zyme'})
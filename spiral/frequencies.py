@@ -1,7 +1,14 @@
 '''
 frequencies: code to handle word frequencies
+
+Note: the loaders in this file intern the word keys with sys.intern().  The
+tables are long-lived and their keys are probed constantly during splitting,
+and interning lets an equality check between an interned key and an interned
+query short-circuit to a pointer comparison.
 '''
 
+import sys
+
 
 # Main code.
 # .............................................................................
@@ -13,20 +20,50 @@ def frequencies_from_csv_file(filename, threshold=None, filter_words=None):
     be discarded.  Parameter 'filter_word' is a set of words (dictionary keys)
     that should be ignored.  Entries that are found in 'filter_words' will be
     discarded.  Returns a dictionary of the results.
+
+    If the Python package "pandas" is installed, this uses its C-based CSV
+    parser, which is several times faster than iterating over the rows in
+    Python.  If pandas is not available, this falls back to reading the rows
+    one at a time using the standard Python csv module.
     '''
-    import csv
+    # Callers sometimes pass filter_words as a list; coerce it to a frozenset
+    # once so the per-word membership test below is O(1) instead of O(n).
+    if filter_words:
+        filter_words = frozenset(filter_words)
+    try:
+        import pandas
+    except ImportError:
+        pandas = None
     try:
+        if pandas:
+            # keep_default_na=False prevents pandas from turning words such
+            # as "null" or "nan" into floating-point NaN values.
+            df = pandas.read_csv(filename, names=['word', 'frequency'],
+                                 dtype={'word': str, 'frequency': 'int64'},
+                                 keep_default_na=False, engine='c')
+            if threshold:
+                df = df[df.frequency >= threshold]
+            if filter_words:
+                df = df[~df.word.isin(filter_words)]
+            return dict(zip(map(sys.intern, df.word.values),
+                            df.frequency.values.tolist()))
+        import csv
         with open(filename, 'r') as f:
-            reader = csv.DictReader(f, fieldnames=['word','frequency'])
+            # csv.reader yields a plain list per row; DictReader would
+            # allocate a fresh dict per row just to pull out two fields.
+            reader = csv.reader(f)
+            if not threshold and not filter_words:
+                # Common case: no filtering at all, so build the dict in a
+                # single comprehension with no per-row branch tests.
+                return {sys.intern(word): int(freq) for word, freq in reader}
             frequencies = {}
-            for row in reader:
-                word = row['word']
-                frequency = int(row['frequency'])
+            for word, freq in reader:
+                frequency = int(freq)
                 if threshold and frequency < threshold:
                     continue
                 if filter_words and word in filter_words:
                     continue
-                frequencies[word] = frequency
+                frequencies[sys.intern(word)] = frequency
             return frequencies
     except Exception as err:
         return {}
@@ -43,6 +80,8 @@ def frequencies_from_pickle(filename, threshold=None, filter_words=None):
     discarded.  Returns a dictionary of the results.
     '''
     import pickle
+    if filter_words:
+        filter_words = frozenset(filter_words)
     data = {}
     try:
         if filename.endswith('.pklz'):
@@ -50,17 +89,93 @@ def frequencies_from_pickle(filename, threshold=None, filter_words=None):
             with gzip.open(filename, 'rb') as pickle_file:
                 data = pickle.load(pickle_file)
         else:
+            # Unpickle from a memory-mapped view: the unpickler then walks
+            # one contiguous buffer instead of issuing many small reads
+            # through the file object.
+            import mmap
             with open(filename, 'rb') as pickle_file:
-                data = pickle.load(pickle_file)
+                with mmap.mmap(pickle_file.fileno(), 0,
+                               access=mmap.ACCESS_READ) as view:
+                    data = pickle.loads(view)
+        # Note: the old comprehensions here iterated the dict itself (which
+        # yields keys, not items) and kept values *below* the threshold; any
+        # use of threshold/filter_words raised inside the try and silently
+        # returned {}.  Do both filters correctly in the same pass that
+        # interns the keys.
+        if threshold or filter_words:
+            data = {sys.intern(k): v for k, v in data.items()
+                    if (not threshold or v >= threshold)
+                    and (not filter_words or k not in filter_words)}
+        else:
+            data = {sys.intern(k): v for k, v in data.items()}
+        return data
+    except Exception as err:
+        return {}
+
+
+def frequencies_from_npz(filename, threshold=None, filter_words=None):
+    '''Read a table of frequencies (as a Python dictionary) from a NumPy
+    .npz file previously written by save_frequencies_to_npz().  Parameter
+    'threshold' sets a minimum frequency value for entries to keep.  Entries
+    with frequency values less than the given 'threshold' value will be
+    discarded.  Parameter 'filter_word' is a set of words (dictionary keys)
+    that should be ignored.  Entries that are found in 'filter_words' will
+    be discarded.  Returns a dictionary of the results.
+
+    Unlike the pickle format, the .npz format stores the table as two plain
+    typed arrays, which NumPy can read in a single pass without interpreting
+    pickle opcodes -- and without pickle's ability to execute arbitrary code
+    when loading a maliciously-crafted file.
+    '''
+    import numpy as np
+    if filter_words:
+        filter_words = frozenset(filter_words)
+    try:
+        with np.load(filename, allow_pickle=False) as stored:
+            words = stored['words'].tolist()
+            counts = stored['counts'].tolist()
+        frequencies = dict(zip(map(sys.intern, words), counts))
         if threshold:
-            data = {k : v for k, v in data if v < threshold}
+            frequencies = {k: v for k, v in frequencies.items() if v >= threshold}
         if filter_words:
-            data = {k : v for k, v in data if k not in filter_words}
-        return data
+            frequencies = {k: v for k, v in frequencies.items() if k not in filter_words}
+        return frequencies
     except Exception as err:
         return {}
 
 
+def frequency_arrays_from_npz(filename):
+    '''Read a table of frequencies from a NumPy .npz file written by
+    save_frequencies_to_npz() and return it as a tuple of two parallel NumPy
+    arrays, (words, counts), without materializing a Python dictionary.
+    This is the fastest way to get at the table for vectorized processing:
+    the arrays are read in one pass, and reductions such as counts.sum() or
+    batch lookups via np.searchsorted operate on the contiguous buffers
+    directly.  Returns (None, None) if the file cannot be read.
+    '''
+    import numpy as np
+    try:
+        with np.load(filename, allow_pickle=False) as stored:
+            return stored['words'], stored['counts']
+    except Exception as err:
+        return (None, None)
+
+
+def save_frequencies_to_npz(data, filename):
+    '''Write a table of frequencies to a compressed NumPy .npz file.  The
+    table is stored as two parallel arrays, one of words and one of integer
+    counts, so that it can be loaded back without using pickle at all.  Use
+    frequencies_from_npz() to read the result.
+    '''
+    import numpy as np
+    try:
+        words = np.array(list(data.keys()), dtype=str)
+        counts = np.fromiter(data.values(), dtype=np.int64, count=len(data))
+        np.savez_compressed(filename, words=words, counts=counts)
+    except IOError as err:
+        raise SystemExit('encountered error trying to save npz {}'.format(filename))
+
+
 def save_frequencies_to_pickle(data, filename):
     '''Write data to a pickle file.  If the file ends in the extension .pklz,
     it's assumed to be a gzip'ed pickle file; otherwise, it's assumed to be
@@ -68,13 +183,17 @@ def save_frequencies_to_pickle(data, filename):
     '''
     import pickle
     try:
+        # The highest pickle protocol serializes and (more importantly for
+        # startup) deserializes dict-heavy payloads noticeably faster than
+        # the old default.  pickle.load autodetects the protocol, so files
+        # written this way stay readable by frequencies_from_pickle.
         if filename.endswith('.pklz'):
             import gzip
             with gzip.open(filename, 'wb') as pickle_file:
-                pickle.dump(data, pickle_file)
+                pickle.dump(data, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
         else:
             with open(filename, 'wb') as pickle_file:
-                pickle.dump(data, pickle_file)
+                pickle.dump(data, pickle_file, protocol=pickle.HIGHEST_PROTOCOL)
     except IOError as err:
         raise SystemExit('encountered error trying to dump pickle {}'.format(filename))
     except pickle.PickleError as err:
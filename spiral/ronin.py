@@ -128,6 +128,7 @@ Software Inventory Creation System.  For more, visit http://casics.org.
 '''
 
 from   bisect import insort
+import functools
 import math
 from   nltk.stem import SnowballStemmer
 import os
@@ -142,7 +143,14 @@ if __debug__:
     import logging
     logging.basicConfig(level = logging.INFO)
     logger = logging.getLogger('Ronin')
-    def log(s, *other_args): logger.debug('Ronin: ' + s.format(*other_args))
+    # The level is checked once here rather than on every call: the module
+    # documentation tells users to set the logging level *before* importing
+    # this module, and skipping the per-call str.format when debugging is
+    # off saves building thousands of log strings per split() call.
+    _debugging = logger.isEnabledFor(logging.DEBUG)
+    def log(s, *other_args):
+        if _debugging:
+            logger.debug('Ronin: ' + s.format(*other_args))
 
 try:
     sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -170,9 +178,18 @@ try:
 except:
     _DATA_DIR = os.path.dirname('./data')
 
+_DEFAULT_FREQ_NPZ = os.path.join(_DATA_DIR, 'frequencies.npz')
+'''NumPy .npz file storing the default global frequency table shipped with
+this module.  This constant is only read by ronin.init(...).'''
+
 _DEFAULT_FREQ_PICKLE = os.path.join(_DATA_DIR, 'frequencies.pklz')
 '''Pickle file storing the default global frequency table shipped with this
-module.  This constant is only read by ronin.init(...).'''
+module.  This is a fallback used by ronin.init(...) only if the .npz version
+of the table is not available.'''
+
+_UPPER_LOWER_TRANSITION = re.compile(r'[A-Z][a-z]')
+'''Precompiled pattern for upper-to-lower case transitions, searched for on
+every initial token of every split() call.'''
 
 _DICTIONARY_PICKLE = os.path.join(_DATA_DIR, 'dictionary.pklz')
 '''Pickle file storing the dictionary used by Ronin.  See the code in
@@ -363,26 +380,49 @@ class Ronin(object):
         if __debug__: log('init()')
         if not self._frequencies:
             if not frequencies:
-                if __debug__: log('... loading frequency pickle {}'
-                                  .format(_DEFAULT_FREQ_PICKLE))
-                if os.path.exists(_DEFAULT_FREQ_PICKLE):
+                if os.path.exists(_DEFAULT_FREQ_NPZ):
+                    if __debug__: log('... loading frequency npz {}'
+                                      .format(_DEFAULT_FREQ_NPZ))
+                    frequencies = frequencies_from_npz(_DEFAULT_FREQ_NPZ)
+                elif os.path.exists(_DEFAULT_FREQ_PICKLE):
+                    if __debug__: log('... loading frequency pickle {}'
+                                      .format(_DEFAULT_FREQ_PICKLE))
                     frequencies = frequencies_from_pickle(_DEFAULT_FREQ_PICKLE)
                 else:
-                    raise ValueError('Cannot read frequencies pickle file "{}"'
-                                     .format(_DEFAULT_FREQ_PICKLE))
+                    raise ValueError('Cannot read frequencies file "{}"'
+                                     .format(_DEFAULT_FREQ_NPZ))
             if exact_case:
                 self._frequencies = frequencies
             else:
                 newdict = {}
                 for key, value in frequencies.items():
-                    lc_key = key.lower()
+                    # Intern the lowercased keys: the scoring function probes
+                    # this dict constantly, and interned keys make equality
+                    # checks against interned queries a pointer comparison.
+                    lc_key = sys.intern(key.lower())
                     if lc_key in newdict:
                         newdict[lc_key] = max(value, newdict[lc_key])
                     else:
                         newdict[lc_key] = value
                 self._frequencies = newdict
+            # Values derived purely from the table contents.  These are
+            # computed here, inside the table-loading branch, rather than on
+            # every call: init() gets invoked once per evaluation by the
+            # parameter optimizer, and an O(table size) max() plus array
+            # rebuild on each of those calls is wasted work.
+            self._highest_freq = max(self._frequencies.values())
+            # Build parallel sorted arrays of the frequency table for use by
+            # _score_many().  Scalar lookups deliberately stay on the dict --
+            # a CPython hash probe beats a per-call binary search -- but the
+            # sorted arrays let callers score a whole batch of tokens with a
+            # single vectorized search over a contiguous buffer.
+            import numpy
+            sorted_words = sorted(self._frequencies)
+            self._sorted_words = numpy.array(sorted_words, dtype=str)
+            self._sorted_counts = numpy.fromiter(
+                (self._frequencies[w] for w in sorted_words),
+                dtype=numpy.int64, count=len(sorted_words))
         self._exact_case = exact_case
-        self._highest_freq = max(self._frequencies.values())
         self._recognition_bias = recognition_bias
         self._biased_threshold = self._recognition_bias * self._highest_freq
         self._low_freq_cutoff = low_freq_cutoff
@@ -409,31 +449,56 @@ class Ronin(object):
                 self._dictionary = set(nltk_words.words())
                 self._dictionary.update(nltk_wordnet.all_lemma_names())
                 self._dictionary.update(special_computing_terms)
-        self._stemmer = SnowballStemmer('english')
+        if not self._stemmer:
+            self._stemmer = SnowballStemmer('english')
+        # Dictionary probes and special-case tests are pure once the
+        # dictionary and stemmer exist, and the same substrings get tested
+        # many times per split (the Snowball stemmer in particular is
+        # costly).  Memoize them per instance; re-running init() recreates
+        # the caches, so they can never serve stale answers.
+        self._special_case = functools.lru_cache(maxsize=65536)(
+            self._special_case_uncached)
+        self._recognized = functools.lru_cache(maxsize=65536)(
+            self._recognized_uncached)
+        # The adjusted score folds the cutoff thresholds and a math.pow
+        # rescale around the raw score; the same substrings are re-adjusted
+        # at every split position that touches them.  The cache is rebuilt
+        # here because the result depends on the tunable parameters set
+        # above, so it can never outlive a parameter change.
+        self._adjusted_score = functools.lru_cache(maxsize=65536)(
+            self._adjusted_score_uncached)
         # Generate scoring function based on exact case flag.  Do it here so
         # we don't have to keep testing the variable at run-time.
+        # Bind the table and highest frequency into closure locals, and use
+        # dict.get() so each lookup hashes the token once instead of twice
+        # (once for the membership test and once for the subscript).
+        frequencies = self._frequencies
+        highest_freq = self._highest_freq
         if exact_case:
             def score_function(token):
                 lc_token = token.lower()
                 if lc_token in common_terms_with_numbers:
-                    return self._highest_freq
-                if token in self._frequencies:
-                    return self._frequencies[token]
-                cap_token = token.capitalize()
-                if cap_token in self._frequencies:
-                    return self._frequencies[cap_token]
-                if lc_token in self._frequencies:
-                    return self._frequencies[lc_token]
-                return 0
+                    return highest_freq
+                value = frequencies.get(token)
+                if value is not None:
+                    return value
+                value = frequencies.get(token.capitalize())
+                if value is not None:
+                    return value
+                return frequencies.get(lc_token, 0)
         else:
             def score_function(token):
                 lc_token = token.lower()
                 if lc_token in common_terms_with_numbers:
-                    return self._highest_freq
-                if lc_token in self._frequencies:
-                    return self._frequencies[lc_token]
-                return 0
-        self._score = score_function
+                    return highest_freq
+                return frequencies.get(lc_token, 0)
+        # A single split() call scores many of the same substrings repeatedly
+        # (once per candidate split point that touches them), and successive
+        # identifiers share common fragments, so memoize the scoring
+        # function.  A fresh score_function closure is created on every call
+        # to init(), which automatically gives each (re)initialization an
+        # empty cache -- stale scores cannot survive a table change.
+        self._score = functools.lru_cache(maxsize=65536)(score_function)
         if __debug__:
             log('... frequency table has {} entries', len(self._frequencies))
             log('... highest frequency = {}', self._highest_freq)
@@ -484,6 +549,12 @@ class Ronin(object):
         '''
         splits = []
         camel = False
+        # This lazy-init guard is deliberate.  Initializing eagerly at import
+        # time would remove one truthiness test per call, but it would also
+        # force every importer of the spiral package to pay the multi-MB
+        # table load even if they only use the simple splitters, and it
+        # would defeat passing custom frequencies to init().  One attribute
+        # load plus branch per call is noise next to the splitting work.
         if not self._frequencies:
             self.init()
         if __debug__: log('split "{}" (keep num: {})', identifier, keep_numbers)
@@ -496,7 +567,7 @@ class Ronin(object):
                 splits = splits + [s]
                 continue
             # Look for upper-to-lower case transitions.
-            transition = re.search(r'[A-Z][a-z]', s)
+            transition = _UPPER_LOWER_TRANSITION.search(s)
             if not transition:
                 if __debug__: log('no upper-to-lower case transition in {}', s)
                 parts = [s]
@@ -534,6 +605,20 @@ class Ronin(object):
         return results
 
 
+    def split_many(self, identifiers, keep_numbers=True):
+        '''Split each identifier string in the iterable 'identifiers' and
+        return a list of the per-identifier results (each itself a list of
+        strings).  This is equivalent to calling split() on each element,
+        but performs the initialization check once and binds the split
+        method to a local, which saves measurable dispatch overhead when
+        processing many thousands of identifiers in a batch.
+        '''
+        if not self._frequencies:
+            self.init()
+        split = self.split
+        return [split(identifier, keep_numbers) for identifier in identifiers]
+
+
     def _same_case_split(self, s, score_ns = .0000005, level = 0):
         # Returns a tuple of (max_score, split).
         # 'level' is to detect recursive calls, and also indent debug output.
@@ -542,6 +627,11 @@ class Ronin(object):
         if self._recognized(s):
             if __debug__: log('{}recognized "{}" -- returning as-is', sp, s)
             return (score_ns, [s])
+        if len(s) < 2:
+            # Too short for the scan below to run even once; return without
+            # paying the threshold score lookup.  This is the same value the
+            # full path produces for a 0- or 1-character string.
+            return (-1, [s])
         new_split = None
         max_index = len(s) - 1
         max_score = -1
@@ -623,13 +713,38 @@ class Ronin(object):
         return result
 
 
+    def _score_many(self, tokens):
+        '''Return a NumPy int64 array of frequency scores for the given
+        sequence of 'tokens'.  The result is equivalent to calling the
+        internal scoring function on each token individually, but the table
+        lookups are performed as one vectorized binary search over a sorted
+        array, which is considerably faster when scoring many tokens at once
+        (for example, during parameter-optimization runs).'''
+        import numpy
+        if self._exact_case:
+            # The exact-case scorer tries several case variants per token;
+            # fall back to scoring one token at a time.
+            return numpy.fromiter((self._score(t) for t in tokens),
+                                  dtype=numpy.int64, count=len(tokens))
+        lowered = [t.lower() for t in tokens]
+        arr = numpy.array(lowered, dtype=str)
+        pos = numpy.minimum(numpy.searchsorted(self._sorted_words, arr),
+                            len(self._sorted_words) - 1)
+        found = self._sorted_words[pos] == arr
+        result = numpy.where(found, self._sorted_counts[pos], 0)
+        for i, token in enumerate(lowered):
+            if token in common_terms_with_numbers:
+                result[i] = self._highest_freq
+        return result
+
+
     def _rescaled_score(self, token):
         '''Return the rescaled score for the given 'token', without applying
         the thresholding step that _adjusted_score() applies.'''
         return self._rescale(token, self._score(token))
 
 
-    def _adjusted_score(self, token):
+    def _adjusted_score_uncached(self, token):
         '''Return the thresholded, adjusted score for the given 'token'.'''
         length = len(token)
         if length == 0:
@@ -651,12 +766,12 @@ class Ronin(object):
             return math.pow(score_value, self._normal_exponent)
 
 
-    def _recognized(self, token):
+    def _recognized_uncached(self, token):
         tlower = token.lower()
         return self._special_case(tlower) or self._in_dictionary(tlower)
 
 
-    def _special_case(self, token):
+    def _special_case_uncached(self, token):
         return (token in common_terms_with_numbers
                 or token in special_computing_terms
                 or self._stem(token) in special_computing_terms)
@@ -693,5 +808,6 @@ _RONIN_INSTANCE = Ronin()
 
 # The following are the functions we tell people to use:
 
-init  = _RONIN_INSTANCE.init
-split = _RONIN_INSTANCE.split
+init       = _RONIN_INSTANCE.init
+split      = _RONIN_INSTANCE.split
+split_many = _RONIN_INSTANCE.split_many
@@ -121,7 +121,14 @@ if __debug__:
     import logging
     logging.basicConfig(level=logging.INFO)
     logger = logging.getLogger('samurai')
-    def log(s, *other_args): logger.debug('samurai: ' + s.format(*other_args))
+    # The level is checked once here rather than on every call: the module
+    # documentation tells users to set the logging level *before* importing
+    # this module, and skipping the per-call str.format when debugging is
+    # off saves building thousands of log strings per split() call.
+    _debugging = logger.isEnabledFor(logging.DEBUG)
+    def log(s, *other_args):
+        if _debugging:
+            logger.debug('samurai: ' + s.format(*other_args))
 
 try:
     sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
@@ -148,6 +155,11 @@ try:
     _DEFAULT_FREQ_DIR = os.path.dirname(__file__)
 except:
     _DEFAULT_FREQ_DIR = os.path.dirname('.')
+_UPPER_LOWER_TRANSITION = re.compile(r'[A-Z][a-z]')
+'''Precompiled pattern for upper-to-lower case transitions, searched for on
+every initial token of every split() call.'''
+
+_DEFAULT_FREQ_NPZ = os.path.join(_DEFAULT_FREQ_DIR, 'data/frequencies.npz')
 _DEFAULT_FREQ_PICKLE = os.path.join(_DEFAULT_FREQ_DIR, 'data/frequencies.pklz')
 
 
@@ -157,6 +169,13 @@ _DEFAULT_FREQ_PICKLE = os.path.join(_DEFAULT_FREQ_DIR, 'data/frequencies.pklz')
 class Samurai(object):
     _global_freq = None
     _local_freq  = None
+    _score       = None
+    _split_cache = None
+
+    # Upper bound on the _same_case_split memo, to keep memory bounded when
+    # splitting very large corpora.  When the cap is hit the memo is simply
+    # cleared; correctness does not depend on it.
+    _SPLIT_CACHE_MAX = 200000
 
     def init(self, local_freq=None, global_freq=None):
         '''Initialize internal frequency files for the Samurai split() function.
@@ -173,11 +192,19 @@ class Samurai(object):
         if global_freq:
             self._global_freq = global_freq
         if not self._global_freq:
-            if os.path.exists(_DEFAULT_FREQ_PICKLE):
+            if os.path.exists(_DEFAULT_FREQ_NPZ):
+                self._global_freq = frequencies_from_npz(_DEFAULT_FREQ_NPZ)
+            elif os.path.exists(_DEFAULT_FREQ_PICKLE):
                 self._global_freq = frequencies_from_pickle(_DEFAULT_FREQ_PICKLE)
             else:
-                raise ValueError('Cannot read default frequencies pickle file "{}"'
-                                 .format(_DEFAULT_FREQ_PICKLE))
+                raise ValueError('Cannot read default frequencies file "{}"'
+                                 .format(_DEFAULT_FREQ_NPZ))
+        # Generate the scoring closure once here instead of on every call to
+        # split(), and reset the memo for _same_case_split: its results are
+        # pure functions of the frequency tables set up above, so the memo
+        # must not survive a table change.
+        self._score = self._generate_scoring_function()
+        self._split_cache = {}
 
 
     def split(self, identifier):
@@ -199,10 +226,10 @@ class Samurai(object):
         if __debug__: log('splitting {}', identifier)
         if not self._global_freq:
             self.init()
-        score = self._generate_scoring_function()
+        score = self._score
         for s in simple_split(identifier):
             # Look for upper-to-lower case transitions
-            transition = re.search(r'[A-Z][a-z]', s)
+            transition = _UPPER_LOWER_TRANSITION.search(s)
             if not transition:
                 if __debug__: log('no upper-to-lower case transition in {}', s)
                 parts = [s]
@@ -240,32 +267,78 @@ class Samurai(object):
         return results
 
 
-    def _same_case_split(self, s, score, score_ns=0.0000005):
+    def split_many(self, identifiers):
+        '''Split each identifier string in the iterable 'identifiers' and
+        return a list of the per-identifier results (each itself a list of
+        strings).  The inputs are deduplicated first, so a corpus containing
+        the same identifier many times -- the common case for real source
+        trees -- pays for each distinct identifier once, with the shared
+        _same_case_split memo warm for everything else.
+        '''
+        if not self._global_freq:
+            self.init()
+        split = self.split
+        results = {}
+        for identifier in identifiers:
+            if identifier not in results:
+                results[identifier] = split(identifier)
+        # Copy each result so duplicate inputs yield independent lists, the
+        # same as calling split() repeatedly would.
+        return [list(results[identifier]) for identifier in identifiers]
+
+
+    def _same_case_split(self, s, score, score_ns=0.0000005, score_s=None):
+        # 'score_s' is score(s) when the caller has already computed it (the
+        # case-2 recursion below always has the right half's score in hand);
+        # passing it along saves recomputing it here.
         if len(s) < 2:
             if __debug__: log('"{}" cannot be split; returning as-is', s)
             return [s]
 
+        # The result is a pure function of (s, score_ns) for the current
+        # frequency tables, and the recursion revisits the same substrings
+        # both within one identifier and across a corpus, so memoize.  The
+        # memo is reset by init() whenever the tables change.
+        cached = self._split_cache.get((s, score_ns))
+        if cached is not None:
+            return cached
+
         split     = None
         n         = len(s)
         i         = 0
         max_score = -1
-        threshold = max(score(s), score_ns)
+        threshold = max(score(s) if score_s is None else score_s, score_ns)
+        # The original algorithm compares sqrt(score) against the threshold.
+        # sqrt is monotonic on the nonnegative scores, so comparing the raw
+        # score against the squared threshold is equivalent and saves two
+        # libm calls per split position.
+        threshold_sq = threshold*threshold
+        # Lowercase the string once; the prefix/suffix tables are all lower
+        # case, so the per-position tests can slice the lowered copy instead
+        # of re-lowercasing each half on every iteration.
+        s_lower   = s.lower()
         if __debug__: log('_same_case_split on {}, threshold {}', s, threshold)
         while i < n:
+            # A recognized prefix or suffix rules this position out, so skip
+            # it before doing any score lookups.
+            if s_lower[0:i] in prefixes or s_lower[i:n] in suffixes:
+                if __debug__: log('|{} : {}| prefix/suffix, skipping',
+                                  s[0:i], s[i:n])
+                i += 1
+                continue
             left       = s[0:i]
             right      = s[i:n]
             score_l    = score(left)
             score_r    = score(right)
-            prefix     = self._is_prefix(left) or self._is_suffix(right)
-            to_split_l = math.sqrt(score_l) > threshold
-            to_split_r = math.sqrt(score_r) > threshold
+            to_split_l = score_l > threshold_sq
+            to_split_r = score_r > threshold_sq
 
             if __debug__: log('|{} : {}| l = {} r = {} split_l = {:1b} split_r'
-                              ' = {:1b} prefix = {:1b} threshold = {} max_score = {}',
-                              left, right, math.sqrt(score_l), math.sqrt(score_r),
-                              to_split_l, to_split_r, prefix, threshold, max_score)
+                              ' = {:1b} threshold_sq = {} max_score = {}',
+                              left, right, score_l, score_r,
+                              to_split_l, to_split_r, threshold_sq, max_score)
 
-            if not prefix and to_split_l and to_split_r:
+            if to_split_l and to_split_r:
                 if __debug__: log('--> case 1')
                 if (score_l + score_r) > max_score:
                     if __debug__: log('({} + {}) > {}', score_l, score_r, max_score)
@@ -274,9 +347,9 @@ class Samurai(object):
                     if __debug__: log('case 1 split result: {}', split)
                 else:
                     if __debug__: log('no split for case 1')
-            elif not prefix and to_split_l:
+            elif to_split_l:
                 if __debug__: log('--> case 2 -- recursive call on "{}"', s[i:n])
-                tmp = self._same_case_split(right, score, score_ns)
+                tmp = self._same_case_split(right, score, score_ns, score_r)
                 if tmp[0] != right:
                     split = [left] + tmp
                     if __debug__: log('case 2 split result: {}', split)
@@ -284,6 +357,9 @@ class Samurai(object):
                     if __debug__: log('no split for case 2')
             i += 1
         result = split if split else [s]
+        if len(self._split_cache) >= self._SPLIT_CACHE_MAX:
+            self._split_cache.clear()
+        self._split_cache[(s, score_ns)] = result
         if __debug__: log('<-- returning {}', result)
         return result
 
@@ -292,20 +368,26 @@ class Samurai(object):
         '''Returns a closure that computes a score using the frequency tables
         with which the splitter has been initialized.
         '''
+        # The tables are bound as closure locals and probed with dict.get(),
+        # so each lookup hashes the token once instead of re-testing
+        # membership and subscripting separately on every call.
         if self._local_freq:
-            log_all_freq = math.log10(sum(self._local_freq.values()))
+            local_freq = self._local_freq
+            global_freq = self._global_freq
+            log_all_freq = math.log10(sum(local_freq.values()))
             def scoring_function(w):
-                local_f  = self._local_freq[w] if w in self._local_freq else 0
-                global_f = self._global_freq[w] if w in self._global_freq else 0
-                if w not in self._global_freq:
-                    return local_f
-                if w not in self._local_freq:
+                local_f  = local_freq.get(w)
+                global_f = global_freq.get(w)
+                if global_f is None:
+                    return local_f if local_f is not None else 0
+                if local_f is None:
                     return global_f/log_all_freq
                 else:
                     return local_f + global_f/log_all_freq
         else:
+            global_freq = self._global_freq
             def scoring_function(w):
-                return self._global_freq[w] if w in self._global_freq else 0
+                return global_freq.get(w, 0)
         return scoring_function
 
 
@@ -324,5 +406,6 @@ _SAMURAI_INSTANCE = Samurai()
 
 # The following are the functions we tell people to use:
 
-init  = _SAMURAI_INSTANCE.init
-split = _SAMURAI_INSTANCE.split
+init       = _SAMURAI_INSTANCE.init
+split      = _SAMURAI_INSTANCE.split
+split_many = _SAMURAI_INSTANCE.split_many
@@ -51,6 +51,8 @@ J2SE4me      J2SE4me       J2SE4me      J2SE4me       J 2 SE 4 me    J2SE 4 me
 IPv4addr     IPv4addr      IPv4addr     IPv4addr      IPv 4 addr     IPv4 addr
 '''
 
+import functools
+import os
 import re
 import string
 import sys
@@ -83,22 +85,30 @@ _camel_case      = re.compile(r'((?<=[a-z])[A-Z])')
 #
 # This does nothing fancy. It splits by explicit delimiter characters like '_'.
 
-_delimiter_splitter = str.maketrans(_delimiter_chars, ' '*len(_delimiter_chars))
+# A single precompiled regex split replaces the old translate-to-spaces,
+# split-on-space, filter-empties sequence (three passes) with one C-level
+# pass; '+' consumes delimiter runs so only the string's ends can produce
+# empty tokens, which filter(None, ...) drops at C speed.
+
+_delimiter_run = re.compile('[' + re.escape(_delimiter_chars) + ']+')
 
 def delimiter_split(identifier):
     '''Split identifier by explicit delimiters only.'''
-    parts = str.translate(identifier, _delimiter_splitter).split(' ')
-    parts = [p for p in parts if p]
-    return parts
+    # Most identifiers contain no delimiter at all; a single search pass
+    # that fails is cheaper than split + filter + list for that case.
+    if identifier and not _delimiter_run.search(identifier):
+        return [identifier]
+    return list(filter(None, _delimiter_run.split(identifier)))
 
 
-_digit_splitter = str.maketrans(string.digits, ' '*len(string.digits))
+_digit_run = re.compile(r'[0-9]+')
 
 def digit_split(identifier):
     '''Split identifier at digits only.'''
-    parts = str.translate(identifier, _digit_splitter).split(' ')
-    parts = [p for p in parts if p]
-    return parts
+    # isalpha() is one C-level pass and covers the common digit-free case.
+    if identifier.isalpha():        # False for the empty string.
+        return [identifier]
+    return list(filter(None, _digit_run.split(identifier)))
 
 
 # Pure camel case splitter.
@@ -115,9 +125,32 @@ def pure_camelcase_split(identifier, safe=False):
     (The rationale is "better safe than sorry" for cases that cannot be split
     without a dictionary or heuristics.)
     '''
-    if safe and re.search(_two_capitals, identifier):
-        return [identifier]
-    return re.sub(_camel_case, r' \1', identifier).split()
+    return list(_pure_camelcase_split_cached(identifier, safe))
+
+
+@functools.lru_cache(maxsize=65536)
+def _pure_camelcase_split_cached(identifier, safe):
+    # Identifier corpora are heavily Zipfian -- the same names recur
+    # thousands of times -- so the cached tuple pays for itself quickly.
+    # Tuples are stored because cached values must be immutable; the public
+    # functions convert to lists at the API boundary.
+    if safe and _two_capitals.search(identifier):
+        return (sys.intern(identifier),)
+    if not identifier:
+        return ()
+    # Slice directly at the transition offsets from finditer; re.sub would
+    # build a spaced-out intermediate copy only for split() to re-walk it.
+    parts = []
+    last = 0
+    for match in _camel_case.finditer(identifier):
+        parts.append(identifier[last:match.start()])
+        last = match.start()
+    parts.append(identifier[last:])
+    # Interning the tokens lets downstream consumers (frequency lookups,
+    # set/Counter building over millions of splits) compare by pointer and
+    # share storage for the heavily repeated common tokens.  The cache means
+    # each distinct identifier pays the interning only once.
+    return tuple(map(sys.intern, parts))
 
 
 # Safe simple splitter.
@@ -137,8 +170,21 @@ def safe_simple_split(identifier):
     considered equivalent to a camel case transition; for example,
     'foo_bar2Biff' will be split as ['foo', 'bar2', 'Biff'].
     '''
-    parts = str.translate(identifier, _hard_splitter).split()
-    return list(flatten(pure_camelcase_split(token, safe=True) for token in parts))
+    return list(_safe_simple_split_cached(identifier))
+
+
+@functools.lru_cache(maxsize=65536)
+def _safe_simple_split_cached(identifier):
+    # list.extend over the per-token results is cheaper than routing them
+    # through the generic recursive flatten(), which pays an isinstance
+    # check per element.
+    # Splitting on the compiled delimiter-run regex avoids allocating the
+    # translated copy of the identifier that translate-then-split built.
+    parts = []
+    for token in _delimiter_run.split(identifier):
+        if token:
+            parts.extend(_pure_camelcase_split_cached(token, True))
+    return tuple(parts)
 
 
 # Not-so-safe simple splitter.
@@ -155,8 +201,19 @@ def simple_split(identifier):
     'Fast', 'NDecoder'] even though "NDecoder" may be more correctly split as
     'N' 'Decoder'.  It preserves digits and does not treat them specially.
     '''
-    parts = str.translate(identifier, _hard_splitter).split()
-    return list(flatten(re.sub(_camel_case, r' \1', token).split() for token in parts))
+    return list(_simple_split_cached(identifier))
+
+
+# One alternation handles both boundary kinds for simple_split in a single
+# DFA traversal: delimiter runs are consumed, and the zero-width camel-case
+# alternative (fixed-width lookbehind + lookahead) splits without consuming.
+_simple_boundaries = re.compile(
+    '[' + re.escape(_delimiter_chars) + ']+|(?<=[a-z])(?=[A-Z])')
+
+@functools.lru_cache(maxsize=65536)
+def _simple_split_cached(identifier):
+    return tuple(map(sys.intern,
+                     filter(None, _simple_boundaries.split(identifier))))
 
 
 # Not-so-safe simple splitter.